@@ -20,7 +20,6 @@
 # -----------------------------------------------------------------------------
 
 import os
-import re
 import sys
 import time
 
@@ -70,10 +69,9 @@ else:
     print("======================================")
     print(f'Execution from {__PLUGIN_EXEC_FROM__}')
 
-    for module in list(sys.modules.keys()):
-        if not re.search(r'^pluginmanager\.', module) is None:
-            print('Reload module: ', module, sys.modules[module])
-            reload(sys.modules[module])
+    for module in [name for name in sys.modules if name.startswith('pluginmanager.')]:
+        print('Reload module: ', module, sys.modules[module])
+        reload(sys.modules[module])
 
     from pluginmanager.pmwindow import PMWindow
 
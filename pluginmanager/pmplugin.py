@@ -27,37 +27,184 @@ from .pmexceptions import (
 import krita
 
 import os
-import re
-import shutil
 import sys
 import zipfile
-import configparser
+
+from collections import deque
 
 import PyQt5.uic
 from PyQt5.Qt import *
 from PyQt5.QtCore import (
-        QStandardPaths
+        pyqtSignal,
+        QEventLoop,
+        QObject,
+        QRunnable,
+        QStandardPaths,
+        QThreadPool
     )
 from PyQt5.QtWidgets import (
-        QMessageBox
+        QMessageBox,
+        QProgressDialog
     )
 
+# plugin installation path, resolved once on first call to Plugins.path()
+_PLUGINS_PATH = None
+# plugin id => enabled state read from Krita settings, emptied on each
+# plugin list refresh
+_ENABLED_PLUGINS = {}
+# plugin list shared by all dialogs, see Plugins.instance()
+_PLUGINS = None
+
+
+def _parseDesktopContent(desktopContent):
+    """Parse given desktop content (<str> or <bytes>)
+
+    Return a dictionary of key/value from 'Desktop Entry' group
+
+    Desktop entries are simple 'key=value' lines: a dedicated parser is used
+    rather than configparser, much slower to initialise and parse
+    """
+    if isinstance(desktopContent, bytes):
+        desktopContent = desktopContent.decode('utf-8', 'replace')
+
+    returned = None
+    inDesktopEntry = False
+    for line in desktopContent.splitlines():
+        line = line.strip()
+        if line == '' or line[0] in '#;':
+            continue
+        elif line[0] == '[':
+            inDesktopEntry = (line == '[Desktop Entry]')
+            if inDesktopEntry and returned is None:
+                returned = {}
+        elif inDesktopEntry:
+            key, separator, value = line.partition('=')
+            if separator != '':
+                returned[key.strip()] = value.strip()
+
+    if returned is None:
+        raise EInvalidValue('Given desktop content has no "Desktop Entry" group')
+
+    return returned
+
+
+class PluginWorkerSignals(QObject):
+    """Signals emitted by a PluginWorker"""
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal()
+
+
+class PluginWorker(QRunnable):
+    """Execute plugin files operations (extraction, removal) outside GUI thread
+
+    Given `operation` is a callable that receives a `progress(current, total)`
+    callable as argument, to report its progression
+    """
+
+    def __init__(self, operation):
+        super(PluginWorker, self).__init__()
+        self.setAutoDelete(False)
+        self.signals = PluginWorkerSignals()
+        self.error = None
+        self.__operation = operation
+
+    def run(self):
+        """Execute operation"""
+        try:
+            self.__operation(self.signals.progress.emit)
+        except Exception as e:
+            self.error = e
+        finally:
+            self.signals.finished.emit()
+
+    @staticmethod
+    def execute(label, operation, parent=None):
+        """Execute given operation in global thread pool
+
+        Wait for operation to be finished while GUI is kept responsive; an
+        application modal progress dialog is shown, so no other action can be
+        made (ie: from plugin manager window) while files are modified
+
+        Exception raised by operation, if any, is raised again
+        """
+        def updateProgress(current, total):
+            progressDialog.setMaximum(total)
+            progressDialog.setValue(current)
+
+        progressDialog = QProgressDialog(label, '', 0, 0, parent)
+        progressDialog.setCancelButton(None)
+        progressDialog.setWindowModality(Qt.ApplicationModal)
+        progressDialog.setMinimumDuration(0)
+        progressDialog.show()
+
+        worker = PluginWorker(operation)
+        eventLoop = QEventLoop()
+        worker.signals.progress.connect(updateProgress)
+        worker.signals.finished.connect(eventLoop.quit)
+
+        QThreadPool.globalInstance().start(worker)
+        eventLoop.exec()
+
+        progressDialog.close()
+        progressDialog.deleteLater()
+
+        if not worker.error is None:
+            raise worker.error
+
+    @staticmethod
+    def removeFiles(fileNames, pathName, progress):
+        """Remove given files and directory `pathName` with its content
+
+        Errors are ignored
+        """
+        fileNames = [fileName for fileName in fileNames if os.path.exists(fileName)]
+        pathNames = []
+
+        if os.path.isdir(pathName):
+            for root, dirs, files in os.walk(pathName, topdown=False):
+                fileNames+=[os.path.join(root, fileName) for fileName in files]
+                pathNames+=[os.path.join(root, dirName) for dirName in dirs]
+            pathNames.append(pathName)
+
+        total = len(fileNames) + len(pathNames)
+        for index, fileName in enumerate(fileNames):
+            try:
+                os.unlink(fileName)
+            except OSError:
+                pass
+            progress(index + 1, total)
+
+        for index, dirName in enumerate(pathNames, len(fileNames)):
+            try:
+                if os.path.islink(dirName):
+                    os.unlink(dirName)
+                else:
+                    os.rmdir(dirName)
+            except OSError:
+                pass
+            progress(index + 1, total)
+
+
 class Plugin(object):
     """A plugin definition"""
     ACTION_VALIDATE_ASK = 0
     ACTION_VALIDATE_YES = 1
     ACTION_VALIDATE_NO = 2
 
-    def __init__(self, desktopFileName=None):
-        self.__id = ''
-        self.__name = ''
-        self.__description = ''
-        self.__path = ''
-        self.__manual = ''
-        self.__desktopFile = ''
-        self.__isActive = False
-        self.__isValid = False
+    __slots__ = (
+            '__id',
+            '__name',
+            '__description',
+            '__path',
+            '__manual',
+            '__desktopFile',
+            '__isActive',
+            '__isValid',
+            '__loadedModules'
+        )
 
+    def __init__(self, desktopFileName=None):
+        self.__defaultValues()
         self.loadFromDesktopFile(desktopFileName)
 
     def __repr__(self):
@@ -65,6 +212,7 @@ class Plugin(object):
         return f"<Plugin({self.__id}, {self.__name},  {self.__isValid}, {self.__isActive}, {self.__path})>"
 
     def __defaultValues(self):
+        """Reset plugin to default values"""
         self.__id = ''
         self.__name = ''
         self.__description = ''
@@ -73,10 +221,10 @@ class Plugin(object):
         self.__desktopFile = ''
         self.__isActive = False
         self.__isValid = False
+        self.__loadedModules = None
 
-    def __loadFromcfgParser(self, cfgParser):
-        """Load plugin from a configparser"""
-        settings=cfgParser['Desktop Entry']
+    def __loadFromSettings(self, settings):
+        """Load plugin from a dictionary of desktop entry settings"""
 
         self.__id = settings.get('X-KDE-Library', '')
         self.__name = settings.get('Name', '')
@@ -92,35 +240,49 @@ class Plugin(object):
             self.__description = '\n'.join(self.__description)
 
         self.__isValid = True
+        self.__isActive = Plugins.isEnabled(self.__id)
 
-        if Krita.instance().readSetting('python', f'enable_{self.__id}', 'false') == 'true':
-            self.__isActive = True
-        else:
-            self.__isActive = False
+    @staticmethod
+    def __dialogParent():
+        """Return widget to use as parent for dialog boxes"""
+        window = Krita.instance().activeWindow()
+        if window is None:
+            return None
+        return window.qwindow()
 
-    def __getMenuLocation(self, location, fromWidget=None):
-        """Return action for given menu location
+    def __moduleNames(self):
+        """Return names of modules loaded from plugin path"""
+        pathPrefix = self.__path + os.sep
+        return [name for name, module in list(sys.modules.items()) if isinstance(getattr(module, '__file__', None), str) and module.__file__.startswith(pathPrefix)]
 
-        location is a string in form 'menu1/menu2/menuN'
+    def __getMenuIndex(self):
+        """Return a dictionary of menus from Krita menu bar
 
-        Return None if not found
+        Keys are menu locations, in form 'menu1/menu2/menuN'
         """
-        idList = location.split('/')
-
-        if fromWidget is None:
-            if not Krita.instance().activeWindow() is None:
-                fromWidget = Krita.instance().activeWindow().qwindow().menuWidget()
-
-        if not fromWidget is None:
-            for action in fromWidget.actions():
-                if action.objectName() == idList[0]:
-                    if len(idList) == 1:
-                        # the last item, return the menu
-                        return action.menu()
-                    else:
-                        return self.__getMenuLocation('/'.join(idList[1:]), action.menu() )
+        returned = {}
+
+        window = Krita.instance().activeWindow()
+        if window is None:
+            return returned
+
+        menuWidget = window.qwindow().menuWidget()
+        if menuWidget is None:
+            return returned
+
+        # breadth first walk of menu tree
+        widgets = deque([('', menuWidget)])
+        while len(widgets) > 0:
+            parentLocation, widget = widgets.popleft()
+            for action in widget.actions():
+                menu = action.menu()
+                if not menu is None:
+                    location = f'{parentLocation}{action.objectName()}'
+                    if not location in returned:
+                        returned[location] = menu
+                        widgets.append((f'{location}/', menu))
 
-        return None
+        return returned
 
     def id(self):
         """Return plugin id"""
@@ -154,50 +316,55 @@ class Plugin(object):
         """Return if plugin is valid or not"""
         return self.__isValid
 
+    def refreshState(self):
+        """Update active state from Krita settings"""
+        if self.__isValid:
+            self.__isActive = Plugins.isEnabled(self.__id)
+
     def loadFromDesktopFile(self, desktopFileName=None):
         """Load plugin from given desktop file name"""
-
-        self.__defaultValues()
-
         if desktopFileName is None:
+            self.__defaultValues()
             return
 
         if not isinstance(desktopFileName, str):
+            self.__defaultValues()
             raise EInvalidType("Given `desktopFileName` must be a <str>")
 
         if os.path.isfile(desktopFileName):
-            if re.search(r'\.desktop$', desktopFileName):
+            if desktopFileName.endswith('.desktop'):
                 self.__desktopFile = desktopFileName
 
-                configParser = configparser.ConfigParser()
-                configParser.read(desktopFileName)
-                self.__loadFromcfgParser(configParser)
+                try:
+                    with open(desktopFileName, 'rb') as file:
+                        self.__loadFromSettings(_parseDesktopContent(file.read()))
+                except Exception:
+                    # don't keep values from a previous definition
+                    self.__defaultValues()
+                    raise
             else:
-                self.__isValid = False
-                self.__isActive = False
+                self.__defaultValues()
                 raise EInvalidValue('Given `desktopFileName` must have ".desktop" extension')
         else:
-            self.__isValid = False
-            self.__isActive = False
+            self.__defaultValues()
             raise EInvalidValue('Given `desktopFileName` file doesn''t exists')
 
     def loadFromDesktopContent(self, desktopContent=''):
         """Load plugin from desktop content definition"""
-
-        self.__defaultValues()
-
-        if desktopContent is None:
+        if desktopContent is None or desktopContent == '':
+            self.__defaultValues()
             return
 
         if not isinstance(desktopContent, str):
+            self.__defaultValues()
             raise EInvalidType("Given `desktopContent` must be a <str>")
 
-        if desktopContent == '':
-            return
-
-        configParser = configparser.ConfigParser()
-        configParser.read_string(desktopContent)
-        self.__loadFromcfgParser(configParser)
+        try:
+            self.__loadFromSettings(_parseDesktopContent(desktopContent))
+        except Exception:
+            # don't keep values from a previous definition
+            self.__defaultValues()
+            raise
 
         # theorical desktop file
         self.__desktopFile = os.path.join(Plugins.path(), f'{self.__id}.desktop')
@@ -212,16 +379,18 @@ class Plugin(object):
             return
 
         self.__isActive = False
-        Krita.instance().writeSetting('python', f'enable_{self.__id}', 'false')
+        Plugins.setEnabled(self.__id, False)
 
-        moduleNames = [name for name in sys.modules.keys()]
-        for moduleName in moduleNames:
-            module = sys.modules[moduleName]
-            if '__file__' in module.__dict__ and isinstance(module.__file__, str) and os.path.dirname(module.__file__) == self.__path:
-                sys.modules.pop(moduleName)
-                # need to check how to do this, but need to remove module completely
-                # del xxxxx
+        if self.__loadedModules is None:
+            # plugin hasn't been activated from here (ie: loaded by Krita at
+            # startup), need to look for its modules
+            self.__loadedModules = self.__moduleNames()
 
+        for moduleName in self.__loadedModules:
+            sys.modules.pop(moduleName, None)
+            # need to check how to do this, but need to remove module completely
+            # del xxxxx
+        self.__loadedModules = None
 
     def activate(self):
         """Activate plugin
@@ -234,7 +403,7 @@ class Plugin(object):
 
         # set plugin activated in Krita settings
         self.__isActive = True
-        Krita.instance().writeSetting('python', f'enable_{self.__id}', 'true')
+        Plugins.setEnabled(self.__id, True)
 
         import inspect
         import importlib
@@ -249,9 +418,8 @@ class Plugin(object):
 
         # make a list of current defined actions
         newActionsList = []
-        actionsListId = []
-        for action in Krita.instance().actions():
-            actionsListId.append(action.objectName())
+        kritaInstance = Krita.instance()
+        actionsListId = {action.objectName() for action in kritaInstance.actions()}
 
         # plugin is loaded
         # need to activate it
@@ -261,7 +429,7 @@ class Plugin(object):
         # from here, we don't really know what the __init__.py have made
         # so lookup the extensions list to search the onbject that has been instancied
         # from the __init__.py plugin
-        for extension in Krita.instance().extensions():
+        for extension in kritaInstance.extensions():
             path = os.path.dirname(inspect.getfile(extension.__class__))
 
             if path == self.__path:
@@ -271,13 +439,15 @@ class Plugin(object):
 
                 if not extension.createActions is None and callable(extension.createActions):
                     # create actions is defined, execute it
-                    extension.createActions(Krita.instance().activeWindow())
+                    extension.createActions(kritaInstance.activeWindow())
 
                     # compare the list of current defined actions with the previous one
                     # new actions has been added by plugin
-                    for action in Krita.instance().actions():
-                        if not action.objectName() in actionsListId:
+                    for action in kritaInstance.actions():
+                        actionId = action.objectName()
+                        if not actionId in actionsListId:
                             newActionsList.append(action)
+                            actionsListId.add(actionId)
 
         # now, plugin is practically ready to be used in Krita
         # menu is unfornately not updated, even if action has been created
@@ -288,13 +458,19 @@ class Plugin(object):
         # it's not clean because there might be a reason why the actionManager
         # has been implemented, but it's currently the only way found to add
         # dynamically an action to menu
+        menuIndex = None
         for action in newActionsList:
             menuLocation = action.property('menulocation')
             if not menuLocation is None:
-                menu = self.__getMenuLocation(action.property('menulocation'))
+                if menuIndex is None:
+                    menuIndex = self.__getMenuIndex()
+                menu = menuIndex.get(menuLocation)
                 if not menu is None:
                     menu.addAction(action)
 
+        # keep modules loaded by plugin, to unload them on deactivation
+        self.__loadedModules = self.__moduleNames()
+
     def uninstall(self, confirmUninstall=None):
         """Uninstall plugin
 
@@ -304,9 +480,11 @@ class Plugin(object):
         if confirmUninstall is None:
             confirmUninstall = Plugin.ACTION_VALIDATE_ASK
 
+        dialogParent = Plugin.__dialogParent()
+
         if confirmUninstall == Plugin.ACTION_VALIDATE_ASK:
             userChoice = QMessageBox.question(
-                    QWidget(),
+                    dialogParent,
                     i18n('Uninstall Plugin'),
                     i18n(f'The plugin "{self.__name}" will be completely removed.\n\nConfirm uninstallation?'),
                     QMessageBox.Yes | QMessageBox.No
@@ -323,19 +501,16 @@ class Plugin(object):
 
         # deactivate plugin if still active
         self.deactivate()
-        Krita.instance().writeSetting('python', f'enable_{self.__id}', None)
-
-        # remove files
-
-        if os.path.exists(self.__desktopFile):
-            os.remove(self.__desktopFile)
+        Plugins.setEnabled(self.__id, None)
 
+        # remove files
         actionFile = os.path.join(QStandardPaths.writableLocation(QStandardPaths.AppDataLocation), 'actions', f'{self.__id}.action')
-        if os.path.exists(actionFile):
-            os.remove(actionFile)
+        pluginFiles = [self.__desktopFile, actionFile]
+        pluginPath = self.__path
 
-        if os.path.exists(self.__path):
-            shutil.rmtree(self.__path, ignore_errors=True)
+        PluginWorker.execute(i18n('Uninstalling plugin "{0}"...').format(self.__name),
+                             lambda progress: PluginWorker.removeFiles(pluginFiles, pluginPath, progress),
+                             dialogParent)
 
         # curent plugin is not valid anymore...
         self.__defaultValues()
@@ -360,10 +535,15 @@ class Plugin(object):
             qDebug(f"File name doesn't exist: {zipFileName}")
             return None
 
+        dialogParent = Plugin.__dialogParent()
+
         try:
             with zipfile.ZipFile(zipFileName, 'r') as archive:
+                # archive content, read once and used for all lookups
+                archiveFiles = archive.infolist()
+
                 # open zip file and search for desktop entry
-                desktopFile = [fileName for fileName in archive.namelist() if re.search(r'\.desktop$', fileName)]
+                desktopFile = [fileSrc.filename for fileSrc in archiveFiles if fileSrc.filename.endswith('.desktop')]
 
                 if len(desktopFile) == 0:
                     qDebug(f"No desktop entry found in archive: {zipFileName}")
@@ -376,8 +556,7 @@ class Plugin(object):
 
                 # initialise plugin with information from desktop entry stored into zip file
                 desktopFileName = desktopFile[0]
-                desktopFile = archive.open(desktopFileName)
-                plugin.loadFromDesktopContent(desktopFile.read().decode())
+                plugin.loadFromDesktopContent(archive.read(desktopFileName).decode('utf-8', 'replace'))
 
                 if not plugin.isValid():
                     # plugin it not valid, stop
@@ -385,19 +564,19 @@ class Plugin(object):
                     return None
 
                 initFileName = os.path.join(plugin.id(), '__init__.py' )
-                initFile = [fileName for fileName in archive.namelist() if re.search(re.escape(initFileName)+'$', fileName)]
-                if len(initFile) == 0:
+                initFile = next((fileSrc for fileSrc in archiveFiles if fileSrc.filename.endswith(initFileName)), None)
+                if initFile is None:
                     # no __init__ file, invalid plugin...
                     qDebug(f"File '{initFileName}' not found in archive: {zipFileName}")
                     return None
                 else:
-                    initFileName = initFile[0]
+                    initFileName = initFile.filename
 
                 # Archive seems to be valid
                 if os.path.exists(plugin.path()):
                     if overwrite == Plugin.ACTION_VALIDATE_ASK:
                         userChoice = QMessageBox.question(
-                                QWidget(),
+                                dialogParent,
                                 i18n('Install Plugin'),
                                 i18n(f'The plugin "{plugin.name()}" already exists.\n\nOverwrite it?'),
                                 QMessageBox.Yes | QMessageBox.No
@@ -424,19 +603,30 @@ class Plugin(object):
                 if initPathLength > 0:
                     initPathLength+=1
 
-                for fileSrc in archive.infolist():
-                    if os.path.basename(fileSrc.filename) == f'{plugin.id()}.desktop':
-                        fileSrc.filename = fileSrc.filename[rootPathLength:]
+                desktopFileBaseName = f'{plugin.id()}.desktop'
+                actionFileBaseName = f'{plugin.id()}.action'
+                desktopPath = Plugins.path()
+                actionsPath = os.path.join(QStandardPaths.writableLocation(QStandardPaths.AppDataLocation), 'actions')
+                pluginPath = plugin.path()
+                nbFiles = len(archiveFiles)
+
+                def extractFiles(progress):
+                    for index, fileSrc in enumerate(archiveFiles):
+                        baseName = os.path.basename(fileSrc.filename)
+                        if baseName == desktopFileBaseName:
+                            fileSrc.filename = fileSrc.filename[rootPathLength:]
 
-                        archive.extract(fileSrc, Plugins.path())
-                    elif os.path.basename(fileSrc.filename) == f'{plugin.id()}.action':
-                        fileSrc.filename = fileSrc.filename[rootPathLength:]
+                            archive.extract(fileSrc, desktopPath)
+                        elif baseName == actionFileBaseName:
+                            fileSrc.filename = fileSrc.filename[rootPathLength:]
 
-                        archive.extract(fileSrc, os.path.join(QStandardPaths.writableLocation(QStandardPaths.AppDataLocation), 'actions') )
-                    elif len(fileSrc.filename) > initPathLength:
-                        fileSrc.filename = fileSrc.filename[initPathLength:]
-                        archive.extract(fileSrc, plugin.path())
+                            archive.extract(fileSrc, actionsPath)
+                        elif len(fileSrc.filename) > initPathLength:
+                            fileSrc.filename = fileSrc.filename[initPathLength:]
+                            archive.extract(fileSrc, pluginPath)
+                        progress(index + 1, nbFiles)
 
+                PluginWorker.execute(i18n('Installing plugin "{0}"...').format(plugin.name()), extractFiles, dialogParent)
 
                 # here, everything is OK: activate plugin
                 plugin.activate()
@@ -453,51 +643,170 @@ class Plugin(object):
 
 
 class Plugins(object):
-    """Manage plugin list"""
+    """Manage plugin list
+
+    Desktop files are only referenced when list is built; they're parsed when
+    plugin is accessed for the first time
+    """
 
     def __init__(self):
+        # plugin id => desktop file name
         self.__plugins = {}
+        # plugin id => Plugin, for plugins already parsed
+        self.__loaded = {}
+        # desktop file name => modification time, when list has been refreshed
+        self.__mtimes = {}
         self.__buildList()
 
     def __buildList(self):
         """Build plugin list"""
         self.__plugins = {}
+        self.__loaded = {}
+        self.__mtimes = {}
+        self.__updateList()
+
+    def __updateList(self):
+        """Update plugin list from plugins directory content
+
+        Only desktop files added or modified since last update are (lazily)
+        reloaded; plugins for which desktop file has been removed are removed
+        """
+        # enabled states might have been modified outside plugin manager
+        _ENABLED_PLUGINS.clear()
 
+        mtimes = {}
         with os.scandir(Plugins.path()) as files:
             for file in files:
-                fullPathName = os.path.join(Plugins.path(), file.name)
-                if re.search(r'\.desktop$', file.name):
-                    self.append(fullPathName)
+                if file.name.endswith('.desktop'):
+                    try:
+                        mtimes[file.path] = file.stat().st_mtime
+                    except OSError:
+                        pass
+
+        for pluginId, desktopFileName in list(self.__plugins.items()):
+            if mtimes.get(desktopFileName) != self.__mtimes.get(desktopFileName):
+                # removed or modified
+                self.__plugins.pop(pluginId)
+                self.__loaded.pop(pluginId, None)
+            elif pluginId in self.__loaded:
+                # not reloaded, but state might have been modified outside
+                # plugin manager
+                self.__loaded[pluginId].refreshState()
+
+        for desktopFileName, mtime in mtimes.items():
+            if self.__mtimes.get(desktopFileName) != mtime:
+                # added or modified
+                self.append(desktopFileName)
+
+        self.__mtimes = mtimes
+
+    def __load(self, id):
+        """Return Plugin for given id, parsing desktop file if not yet loaded
+
+        Return None if desktop file is not a valid plugin definition
+        """
+        if id in self.__loaded:
+            return self.__loaded[id]
+
+        desktopFileName = self.__plugins.pop(id)
+        try:
+            plugin = Plugin(desktopFileName)
+        except:
+            return None
+
+        if plugin.id() == '':
+            return None
+
+        # id was provisional (desktop file name), use id from desktop entry
+        self.__plugins[plugin.id()] = desktopFileName
+        self.__loaded[plugin.id()] = plugin
+        return plugin
+
+    def __loadAll(self):
+        """Ensure all plugins are loaded"""
+        for pluginId in [pluginId for pluginId in self.__plugins if not pluginId in self.__loaded]:
+            self.__load(pluginId)
+
+    @staticmethod
+    def instance():
+        """Return plugin list shared by all callers
+
+        List is built on first call; use refresh() to update it
+        """
+        global _PLUGINS
+        if _PLUGINS is None:
+            _PLUGINS = Plugins()
+
+        return _PLUGINS
 
     @staticmethod
     def path():
         """Return plugin installation path"""
-        returned = os.path.join(QStandardPaths.writableLocation(QStandardPaths.AppDataLocation), 'pykrita')
-        if not os.path.exists(returned):
-            os.mkdir(dest)
+        global _PLUGINS_PATH
+        if _PLUGINS_PATH is None:
+            _PLUGINS_PATH = os.path.join(QStandardPaths.writableLocation(QStandardPaths.AppDataLocation), 'pykrita')
+            os.makedirs(_PLUGINS_PATH, exist_ok=True)
 
-        return returned
+        return _PLUGINS_PATH
+
+    @staticmethod
+    def isEnabled(id):
+        """Return True if plugin is enabled in Krita settings
+
+        Setting is read from Krita once per plugin list refresh
+        """
+        if not id in _ENABLED_PLUGINS:
+            _ENABLED_PLUGINS[id] = (Krita.instance().readSetting('python', f'enable_{id}', 'false') == 'true')
+
+        return _ENABLED_PLUGINS[id]
+
+    @staticmethod
+    def setEnabled(id, value):
+        """Set plugin enabled state in Krita settings
+
+        If `value` is None, setting is removed
+        """
+        kritaInstance = Krita.instance()
+        if value is None:
+            _ENABLED_PLUGINS.pop(id, None)
+            kritaInstance.writeSetting('python', f'enable_{id}', None)
+        else:
+            _ENABLED_PLUGINS[id] = value
+            kritaInstance.writeSetting('python', f'enable_{id}', 'true' if value else 'false')
 
     def length(self):
         """Return number of plugins"""
-        return len(self.__plugins)
+        # desktop files not yet parsed might not be valid plugins
+        self.__loadAll()
+        return len(self.__loaded)
 
     def append(self, plugin):
         """Append a plugin to list
 
+        Given `plugin` can be a Plugin or a desktop file name; in this case
+        the desktop file will be parsed on first access to plugin
+
         Return True if added, otherwise False"
         """
 
         if isinstance(plugin, str):
-            try:
-                plugin = Plugin(plugin)
-            except:
+            if not plugin.endswith('.desktop'):
                 return False
+            # file name is used as provisional id
+            self.__plugins[os.path.splitext(os.path.basename(plugin))[0]] = plugin
+            return True
         elif not isinstance(plugin, Plugin):
             return False
 
         if plugin.id() != '':
-            self.__plugins[plugin.id()] = plugin
+            self.__plugins[plugin.id()] = plugin.desktopFile()
+            self.__loaded[plugin.id()] = plugin
+            # plugin is already loaded: on next refresh, desktop file must not
+            # be considered as added or modified
+            try:
+                self.__mtimes[plugin.desktopFile()] = os.stat(plugin.desktopFile()).st_mtime
+            except OSError:
+                pass
             return True
 
         return False
@@ -508,7 +817,10 @@ class Plugins(object):
             raise EInvalidType('Given `id` must be a <str>')
 
         if id in self.__plugins:
-            self.__plugins.pop(id)
+            # desktop file will be reloaded on refresh if it still exists
+            self.__mtimes.pop(self.__plugins.pop(id), None)
+        if id in self.__loaded:
+            self.__loaded.pop(id)
 
     def plugin(self, id):
         """Return plugin from given id
@@ -519,23 +831,26 @@ class Plugins(object):
             raise EInvalidType('Given `id` must be a <str>')
 
         if id in self.__plugins:
-            return self.__plugins[id]
+            returned = self.__load(id)
+            if not returned is None and returned.id() == id:
+                return returned
+
+        # desktop file name might not match plugin id
+        self.__loadAll()
+        if id in self.__loaded:
+            return self.__loaded[id]
 
         return None
 
     def plugins(self):
         """Return a list of plugins"""
-        returned = []
-        for pluginId in self.__plugins:
-            returned.append(self.__plugins[pluginId])
-
-        return returned
+        self.__loadAll()
+        return list(self.__loaded.values())
 
     def refresh(self):
-        """Refresh plugin list"""
-        self.__buildList()
-
-
-
-
+        """Refresh plugin list
 
+        Only plugins for which desktop file has been added, modified or removed
+        since last refresh are updated
+        """
+        self.__updateList()
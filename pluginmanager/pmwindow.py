@@ -19,16 +19,18 @@
 # A Krita plugin designed to manage plugins
 # -----------------------------------------------------------------------------
 
-import os
-
-import PyQt5.uic
-
 from krita import Window
 
 from PyQt5.Qt import *
 from PyQt5.QtCore import (
         pyqtSignal,
-        QResource
+        pyqtSlot,
+        QFile,
+        QIODevice,
+        QItemSelection,
+        QResource,
+        QSortFilterProxyModel,
+        QTimer
     )
 from PyQt5.QtWidgets import (
         QDialog,
@@ -38,6 +40,7 @@ from PyQt5.QtWidgets import (
     )
 
 from PyQt5.QtGui import (
+        QStandardItem,
         QStandardItemModel
     )
 
@@ -61,19 +64,54 @@ class PMPluginList(QTreeView):
 
     USERROLE_PLUGIN = Qt.UserRole + 1
 
+    # emitted when a plugin item has been changed (ie: checked/unchecked)
+    itemChanged = pyqtSignal('QStandardItem*')
+
+    FLAGS_NAME = Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsUserCheckable
+    FLAGS_DESC = Qt.ItemIsSelectable | Qt.ItemIsEnabled
+
 
     def __init__(self, parent=None):
         super(PMPluginList, self).__init__(parent)
         self.__model = None
+        # sort is made through proxy: source model rows are never moved
+        self.__proxyModel = None
+        # plugin id => QPersistentModelIndex of row (column 'NAME')
+        self.__idIndex = {}
+        # selected item/plugin, computed on first request after a selection change
+        self.__selectionCached = False
+        self.__selectedItem = None
+        self.__selectedPlugin = None
+        # header labels, translated once as headers are initialised on each clear()
+        self.__headerLabels = {
+                PMPluginList.COLNUM_NAME: i18n("Plugin name"),
+                PMPluginList.COLNUM_DESC: i18n("Description name")
+            }
         self.__initHeaders()
 
     def __initHeaders(self):
-        """Initialise treeview header & model"""
+        """Initialise treeview header & model
+
+        If a model was already defined, it's replaced by a new empty one
+        """
+        oldModel = self.__model
+
         self.__model = QStandardItemModel(0, PMPluginList.COLNUM_LAST + 1, self)
-        self.__model.setHeaderData(self.COLNUM_NAME, Qt.Horizontal, i18n("Plugin name"))
-        self.__model.setHeaderData(self.COLNUM_DESC, Qt.Horizontal, i18n("Description name"))
+        self.__model.setHeaderData(self.COLNUM_NAME, Qt.Horizontal, self.__headerLabels[self.COLNUM_NAME])
+        self.__model.setHeaderData(self.COLNUM_DESC, Qt.Horizontal, self.__headerLabels[self.COLNUM_DESC])
+        self.__model.itemChanged.connect(self.itemChanged, Qt.DirectConnection)
+
+        if not oldModel is None:
+            # view, proxy and selection model are kept, only source model is
+            # replaced
+            self.__proxyModel.setSourceModel(self.__model)
+            oldModel.deleteLater()
+            return
 
-        self.setModel(self.__model)
+        self.__proxyModel = QSortFilterProxyModel(self)
+        self.__proxyModel.setSortCaseSensitivity(Qt.CaseInsensitive)
+        self.__proxyModel.setSourceModel(self.__model)
+        self.setModel(self.__proxyModel)
 
         # set colums size rules
         header = self.header()
@@ -83,29 +121,97 @@ class PMPluginList(QTreeView):
 
         header.setSortIndicatorShown(True)
         header.setSectionsClickable(True)
+        self.setSortingEnabled(True)
+        self.sortByColumn(self.COLNUM_NAME, Qt.AscendingOrder)
+
+        self.selectionModel().selectionChanged.connect(self.__invalidateSelection, Qt.DirectConnection)
+
+    @pyqtSlot(QItemSelection, QItemSelection)
+    def __invalidateSelection(self, selected=None, deselected=None):
+        """Selection has changed, cached selected item/plugin are not valid anymore"""
+        self.__selectionCached = False
+        self.__selectedItem = None
+        self.__selectedPlugin = None
+
+    def __updateSelection(self):
+        """Update cached selected item/plugin if needed"""
+        if self.__selectionCached:
+            return
+
+        smodel=self.selectionModel().selectedRows(PMPluginList.COLNUM_NAME)
+
+        if len(smodel) == 1:
+            self.__selectedItem = self.__model.itemFromIndex(self.__proxyModel.mapToSource(smodel[0]))
+            self.__selectedPlugin = self.__selectedItem.data(PMPluginList.USERROLE_PLUGIN)
+        else:
+            self.__selectedItem = None
+            self.__selectedPlugin = None
+
+        self.__selectionCached = True
+
+    def __newRow(self, plugin):
+        """Return a new row (list of QStandardItem) for given plugin"""
+        if plugin.isValid():
+            nameFlags = PMPluginList.FLAGS_NAME
+            descFlags = PMPluginList.FLAGS_DESC
+        else:
+            # invalid plugins are shown disabled
+            nameFlags = PMPluginList.FLAGS_NAME & ~Qt.ItemIsEnabled
+            descFlags = PMPluginList.FLAGS_DESC & ~Qt.ItemIsEnabled
+
+        nameItem = QStandardItem(plugin.name())
+        nameItem.setFlags(nameFlags)
+        if plugin.isActive():
+            nameItem.setCheckState(Qt.Checked)
+        else:
+            nameItem.setCheckState(Qt.Unchecked)
+        nameItem.setData(plugin, PMPluginList.USERROLE_PLUGIN)
+
+        descItem = QStandardItem(plugin.description())
+        descItem.setFlags(descFlags)
+
+        return [nameItem, descItem]
+
+    def __appendRow(self, plugin):
+        """Append a row for given plugin"""
+        newRow = self.__newRow(plugin)
+        self.__model.appendRow(newRow)
+        self.__idIndex[plugin.id()] = QPersistentModelIndex(newRow[self.COLNUM_NAME].index())
 
     def addPlugin(self, plugin):
         """Add a plugin to list"""
         #if not isinstance(plugin, Plugin):
         #    raise EInvalidType('Given `plugin` must be a <Plugin>')
 
-        newRow = [
-                QStandardItem(''),
-                QStandardItem('')
-            ]
+        self.__appendRow(plugin)
+        self.__invalidateSelection()
 
-        newRow[self.COLNUM_NAME].setFlags(newRow[self.COLNUM_NAME].flags() | Qt.ItemIsUserCheckable)
-        if plugin.isActive():
-            newRow[self.COLNUM_NAME].setCheckState(Qt.Checked)
-        else:
-            newRow[self.COLNUM_NAME].setCheckState(Qt.Unchecked)
-        newRow[self.COLNUM_NAME].setText(plugin.name())
-        newRow[self.COLNUM_NAME].setData(plugin, PMPluginList.USERROLE_PLUGIN)
-        newRow[self.COLNUM_NAME].setEnabled(plugin.isValid())
-        newRow[self.COLNUM_DESC].setText(plugin.description())
-        newRow[self.COLNUM_DESC].setEnabled(plugin.isValid())
+    def addPlugins(self, plugins):
+        """Add a list of plugins to list
 
-        self.__model.appendRow(newRow)
+        View updates are disabled while rows are added
+        """
+        self.setUpdatesEnabled(False)
+        try:
+            for plugin in plugins:
+                self.__appendRow(plugin)
+        finally:
+            self.setUpdatesEnabled(True)
+        self.__invalidateSelection()
+
+    def removePluginById(self, id):
+        """Remove plugin from list
+
+        Return True if plugin has been removed, otherwise False
+        """
+        if not id in self.__idIndex:
+            return False
+
+        index = self.__idIndex.pop(id)
+        if index.isValid():
+            self.__model.removeRow(index.row())
+        self.__invalidateSelection()
+        return True
 
     def resizeColumns(self):
         """Resize columns to content"""
@@ -113,32 +219,30 @@ class PMPluginList(QTreeView):
         self.resizeColumnToContents(self.COLNUM_DESC)
 
     def clear(self):
-        """Clear content"""
-        self.__model.removeRows(0, self.__model.rowCount())
+        """Clear content
+
+        Current model is replaced by a new empty one, rather than removing
+        rows one by one
+        """
+        self.__idIndex.clear()
+        self.__initHeaders()
+        self.__invalidateSelection()
 
     def selectedPlugin(self):
         """Return selected plugin
 
         return None if no plugin is selected
         """
-        smodel=self.selectionModel().selectedRows(PMPluginList.COLNUM_NAME)
-
-        if len(smodel) == 1:
-            return smodel[0].data(PMPluginList.USERROLE_PLUGIN)
-
-        return None
+        self.__updateSelection()
+        return self.__selectedPlugin
 
     def selectedItem(self):
         """Return selected item (column 'NAME')
 
         return None if no plugin is selected
         """
-        smodel=self.selectionModel().selectedRows(PMPluginList.COLNUM_NAME)
-
-        if len(smodel) == 1:
-            return self.model().itemFromIndex(smodel[0])
-
-        return None
+        self.__updateSelection()
+        return self.__selectedItem
 
     def selectPlugin(self, plugin=None):
         """Select plugin in list
@@ -152,14 +256,16 @@ class PMPluginList(QTreeView):
         else:
             id = None
 
-        root = self.model().invisibleRootItem()
+        if id is None:
+            first = self.__proxyModel.index(0, PMPluginList.COLNUM_NAME)
+        elif id in self.__idIndex:
+            first = self.__proxyModel.mapFromSource(QModelIndex(self.__idIndex[id]))
+        else:
+            return
 
-        for rowIndex in range(root.rowCount()):
-            if root.child(rowIndex, 0).data(PMPluginList.USERROLE_PLUGIN).id() == id or id is None:
-                first = root.child(rowIndex, 0).index()
-                last = root.child(rowIndex, PMPluginList.COLNUM_LAST).index()
-                self.selectionModel().select(QItemSelection(first, last), QItemSelectionModel.ClearAndSelect)
-                break
+        if first.isValid():
+            last = first.sibling(first.row(), PMPluginList.COLNUM_LAST)
+            self.selectionModel().select(QItemSelection(first, last), QItemSelectionModel.ClearAndSelect)
 
 
 class PMWindow(QDialog):
@@ -167,6 +273,11 @@ class PMWindow(QDialog):
 
     dialogShown = pyqtSignal()
 
+    # manuals are truncated to this size (in bytes)
+    MANUAL_MAX_SIZE = 256 * 1024
+    # manuals from this size (in bytes) are memory mapped rather than read
+    MANUAL_MAP_SIZE = 64 * 1024
+
     # region: initialisation methods -------------------------------------------
 
     def __init__(self, name, version, parent=None):
@@ -177,26 +288,55 @@ class PMWindow(QDialog):
             raise EInvalidType('Given `version` must be a <str>')
 
         self.__eventCallBack = {}
-
-        uiFileName = os.path.join(os.path.dirname(__file__), 'resources', 'pmwindow.ui')
-        PyQt5.uic.loadUi(uiFileName, self)
+        # plugin id => manual content (or message if manual is not available)
+        self.__manualCache = {}
+        # when True, itemChanged signal is ignored (check state updated from code)
+        self.__suppressItemChanged = False
+        # translated texts
+        self.__tr = {
+                'noManual': i18n("Sorry, no manual was provided for this plugin..."),
+                'unreadableManual': i18n("Sorry, I'm unable to read the manual..."),
+                'installTitle': i18n('Install Plugin'),
+                'installed': i18n('The plugin "{0}" has been installed!'),
+                'uninstallTitle': i18n('Uninstall Plugin'),
+                'uninstalled': i18n('The plugin "{0}" has been uninstalled!')
+            }
+
+        self.__setupUi()
 
         self.setWindowTitle(f'{name} v{version}')
 
-        self.buttonBox.accepted.connect(self.accept)
-        self.tvPluginList.selectionModel().selectionChanged.connect(self.__selectionChanged)
-        self.tvPluginList.model().itemChanged.connect(self.__itemChanged)
+        self.buttonBox.accepted.connect(self.accept, Qt.DirectConnection)
+        self.tvPluginList.selectionModel().selectionChanged.connect(self.__selectionChanged, Qt.DirectConnection)
+        self.tvPluginList.itemChanged.connect(self.__itemChanged, Qt.DirectConnection)
 
-        self.tbInstall.clicked.connect(self.__installPlugin)
-        self.tbUninstall.clicked.connect(self.__uninstallPlugin)
-        self.tbActivate.clicked.connect(self.__activatePlugin)
+        self.tbInstall.clicked.connect(self.__installPlugin, Qt.DirectConnection)
+        self.tbUninstall.clicked.connect(self.__uninstallPlugin, Qt.DirectConnection)
+        self.tbActivate.clicked.connect(self.__activatePlugin, Qt.DirectConnection)
 
-        self.__plugins = Plugins()
+        self.__plugins = Plugins.instance()
 
         self.__updateButtons()
         self.__buildList()
         self.tvPluginList.selectPlugin()
 
+    def __setupUi(self):
+        """Initialise dialog widgets from compiled ui module
+
+        Module resources/pmwindow_ui.py is generated from resources/pmwindow.ui
+        and must be regenerated each time ui file is modified:
+            pyuic5 resources/pmwindow.ui -o resources/pmwindow_ui.py
+        """
+        # imported here as generated module imports PMPluginList from this module
+        from .resources.pmwindow_ui import Ui_Dialog
+
+        # widgets are created as attributes of ui object; like loadUi(), they're
+        # made available as dialog attributes
+        ui = Ui_Dialog()
+        ui.setupUi(self)
+        for name, value in vars(ui).items():
+            setattr(self, name, value)
+
     # endregion: initialisation methods ----------------------------------------
 
     # region: events- ----------------------------------------------------------
@@ -219,9 +359,15 @@ class PMWindow(QDialog):
                 # execute my_callback_function() when dialog became visible
                 dlgMain.dialogShown.connect(my_callback_function)
         """
-        self.splitterManual.setSizes([1000, 1000])
-
         super(PMWindow, self).showEvent(event)
+
+        # let Qt process pending layout before applying sizes, to do it once
+        QTimer.singleShot(0, self.__dialogShown)
+
+    def __dialogShown(self):
+        """Apply sizes once dialog geometry is known, and emit dialogShown"""
+        self.splitterManual.setSizes([1000, 1000])
+        self.tvPluginList.resizeColumns()
         self.dialogShown.emit()
 
     def closeEvent(self, event):
@@ -261,24 +407,29 @@ class PMWindow(QDialog):
         self.__eventCallBack[object] = method
         object.installEventFilter(self)
 
-    def __selectionChanged(self, selection):
+    @pyqtSlot(QItemSelection, QItemSelection)
+    def __selectionChanged(self, selected, deselected):
         plugin=self.tvPluginList.selectedPlugin()
 
         if not plugin is None:
-            if plugin.manualFile() != '':
-                try:
-                    with open(plugin.manualFile(), "r") as file:
-                        data=file.readlines()
-                        self.lblManual.setText(''.join(data))
-                except:
-                    self.lblManual.setText("Sorry, I'm unable to read the manual...")
-            else:
-                self.lblManual.setText("Sorry, no manual was provided for this plugin...")
+            if not plugin.id() in self.__manualCache:
+                # missing and unreadable manuals are cached too, to avoid
+                # trying to read them again
+                if plugin.manualFile() != '':
+                    try:
+                        self.__manualCache[plugin.id()] = self.__readManual(plugin.manualFile())
+                    except:
+                        self.__manualCache[plugin.id()] = self.__tr['unreadableManual']
+                else:
+                    self.__manualCache[plugin.id()] = self.__tr['noManual']
+
+            self.lblManual.setText(self.__manualCache[plugin.id()])
         else:
             self.lblManual.setText("")
 
         self.__updateButtons()
 
+    @pyqtSlot(bool)
     def __installPlugin(self, action):
         """Install a plugin"""
         fileName = QFileDialog.getOpenFileName(self,
@@ -288,10 +439,12 @@ class PMWindow(QDialog):
         if fileName[0] != '':
             self.installPlugin(fileName[0])
 
+    @pyqtSlot(bool)
     def __uninstallPlugin(self, action):
         """uninstall a plugin"""
         self.uninstallPlugin(self.tvPluginList.selectedPlugin())
 
+    @pyqtSlot(bool)
     def __activatePlugin(self, action):
         """Activate/deactivate a plugin"""
         if action:
@@ -299,17 +452,62 @@ class PMWindow(QDialog):
         else:
             self.deactivatePlugin()
 
+    @pyqtSlot('QStandardItem*')
     def __itemChanged(self, value):
         """A plugin has been checked/unchecked"""
+        if self.__suppressItemChanged:
+            return
+
+        # changed item is not necessarily the selected one
+        plugin = value.data(PMPluginList.USERROLE_PLUGIN)
+        if plugin is None:
+            return
+
         if value.checkState() == Qt.Checked:
-            self.activatePlugin()
+            plugin.activate()
         else:
-            self.deactivatePlugin()
+            plugin.deactivate()
+        self.__updateButtons()
 
     # endregion: events --------------------------------------------------------
 
     # region: methods ----------------------------------------------------------
 
+    def __readManual(self, fileName):
+        """Return content of given manual file, truncated to MANUAL_MAX_SIZE
+
+        Large files are memory mapped to avoid an intermediate read buffer
+
+        Raise an EInvalidValue if file can't be read
+        """
+        file = QFile(fileName)
+        if not file.open(QIODevice.ReadOnly):
+            raise EInvalidValue(f'Unable to open manual file: {fileName}')
+
+        try:
+            size = min(file.size(), PMWindow.MANUAL_MAX_SIZE)
+            data = None
+            if size >= PMWindow.MANUAL_MAP_SIZE:
+                mapped = file.map(0, size)
+                if not mapped is None:
+                    data = mapped.asstring(size)
+                    file.unmap(mapped)
+
+            if data is None:
+                data = bytes(file.read(size))
+        finally:
+            file.close()
+
+        return data.decode('utf-8', 'replace')
+
+    def __setItemCheckState(self, item, checkState):
+        """Set check state of item without triggering plugin (de)activation"""
+        self.__suppressItemChanged = True
+        try:
+            item.setCheckState(checkState)
+        finally:
+            self.__suppressItemChanged = False
+
     def __updateButtons(self):
         """Update buttons according to selection"""
         plugin=self.tvPluginList.selectedPlugin()
@@ -328,33 +526,40 @@ class PMWindow(QDialog):
         self.__plugins.refresh()
         self.tvPluginList.clear()
 
-        for plugin in self.__plugins.plugins():
-            self.tvPluginList.addPlugin(plugin)
+        self.tvPluginList.addPlugins(self.__plugins.plugins())
 
-        self.tvPluginList.resizeColumns()
+        # model has been replaced without selectionChanged signal being emitted:
+        # nothing is selected anymore
+        self.lblManual.setText("")
+        self.__updateButtons()
+
+        if self.isVisible():
+            # when not visible, columns are resized once dialog is shown
+            QTimer.singleShot(0, self.tvPluginList.resizeColumns)
 
     def activatePlugin(self):
         """Activate the current selected plugin"""
-        plugin=self.tvPluginList.selectedPlugin()
-        if plugin is None:
+        item=self.tvPluginList.selectedItem()
+        if item is None:
             return
 
+        plugin=item.data(PMPluginList.USERROLE_PLUGIN)
         plugin.activate()
 
-        item=self.tvPluginList.selectedItem()
-        item.setCheckState(Qt.Checked)
+        self.__setItemCheckState(item, Qt.Checked)
         self.__updateButtons()
 
 
     def deactivatePlugin(self):
         """Deactivate the current selected plugin"""
-        plugin=self.tvPluginList.selectedPlugin()
-        if plugin is None:
+        item=self.tvPluginList.selectedItem()
+        if item is None:
             return
+
+        plugin=item.data(PMPluginList.USERROLE_PLUGIN)
         plugin.deactivate()
 
-        item=self.tvPluginList.selectedItem()
-        item.setCheckState(Qt.Unchecked)
+        self.__setItemCheckState(item, Qt.Unchecked)
         self.__updateButtons()
 
     def installPlugin(self, fileName):
@@ -362,13 +567,19 @@ class PMWindow(QDialog):
         plugin = Plugin.install(fileName)
         if plugin is None:
             return
-        self.refreshList()
+
+        # update list with installed plugin only (replace it if overwritten)
+        self.__plugins.append(plugin)
+        self.__manualCache.pop(plugin.id(), None)
+        self.tvPluginList.removePluginById(plugin.id())
+        self.tvPluginList.addPlugin(plugin)
         self.tvPluginList.selectPlugin(plugin)
+        QTimer.singleShot(0, self.tvPluginList.resizeColumns)
 
         QMessageBox.information(
-                QWidget(),
-                i18n('Install Plugin'),
-                i18n(f'The plugin "{plugin.name()}" has been installed!')
+                self,
+                self.__tr['installTitle'],
+                self.__tr['installed'].format(plugin.name())
             )
 
 
@@ -381,20 +592,26 @@ class PMWindow(QDialog):
             return
 
         name = plugin.name()
+        # plugin is reset once uninstalled, keep its id
+        pluginId = plugin.id()
 
         if plugin.uninstall():
-            self.refreshList()
-            self.tvPluginList.selectPlugin(plugin)
+            self.__plugins.remove(pluginId)
+            self.__manualCache.pop(pluginId, None)
+            self.tvPluginList.removePluginById(pluginId)
+            self.tvPluginList.selectPlugin()
+            QTimer.singleShot(0, self.tvPluginList.resizeColumns)
 
             QMessageBox.information(
-                    QWidget(),
-                    i18n('Uninstall Plugin'),
-                    i18n(f'The plugin "{name}" has been uninstalled!')
+                    self,
+                    self.__tr['uninstallTitle'],
+                    self.__tr['uninstalled'].format(name)
                 )
                 
 
     def refreshList(self):
         """Refresh current plugin list"""
+        self.__manualCache.clear()
         self.__buildList()
 
     # endregion: methods -------------------------------------------------------
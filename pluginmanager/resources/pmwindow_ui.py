@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'pmwindow.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_Dialog(object):
+    def setupUi(self, Dialog):
+        Dialog.setObjectName("Dialog")
+        Dialog.resize(1100, 840)
+        self.verticalLayout_2 = QtWidgets.QVBoxLayout(Dialog)
+        self.verticalLayout_2.setObjectName("verticalLayout_2")
+        self.widget = QtWidgets.QWidget(Dialog)
+        self.widget.setMinimumSize(QtCore.QSize(0, 0))
+        self.widget.setObjectName("widget")
+        self.horizontalLayout_3 = QtWidgets.QHBoxLayout(self.widget)
+        self.horizontalLayout_3.setContentsMargins(-1, 0, -1, 0)
+        self.horizontalLayout_3.setObjectName("horizontalLayout_3")
+        self.horizontalLayout_2 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_2.setObjectName("horizontalLayout_2")
+        self.tbInstall = QtWidgets.QToolButton(self.widget)
+        self.tbInstall.setAutoRaise(True)
+        self.tbInstall.setObjectName("tbInstall")
+        self.horizontalLayout_2.addWidget(self.tbInstall)
+        self.tbUninstall = QtWidgets.QToolButton(self.widget)
+        self.tbUninstall.setAutoRaise(True)
+        self.tbUninstall.setObjectName("tbUninstall")
+        self.horizontalLayout_2.addWidget(self.tbUninstall)
+        self.tbActivate = QtWidgets.QToolButton(self.widget)
+        self.tbActivate.setCheckable(True)
+        self.tbActivate.setAutoRaise(True)
+        self.tbActivate.setObjectName("tbActivate")
+        self.horizontalLayout_2.addWidget(self.tbActivate)
+        spacerItem = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_2.addItem(spacerItem)
+        self.horizontalLayout_3.addLayout(self.horizontalLayout_2)
+        self.verticalLayout_2.addWidget(self.widget)
+        self.frame = QtWidgets.QFrame(Dialog)
+        self.frame.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.frame.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame.setObjectName("frame")
+        self.verticalLayout = QtWidgets.QVBoxLayout(self.frame)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.splitterManual = QtWidgets.QSplitter(self.frame)
+        self.splitterManual.setOrientation(QtCore.Qt.Vertical)
+        self.splitterManual.setObjectName("splitterManual")
+        self.tvPluginList = PMPluginList(self.splitterManual)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(1)
+        sizePolicy.setHeightForWidth(self.tvPluginList.sizePolicy().hasHeightForWidth())
+        self.tvPluginList.setSizePolicy(sizePolicy)
+        self.tvPluginList.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.tvPluginList.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
+        self.tvPluginList.setRootIsDecorated(False)
+        self.tvPluginList.setUniformRowHeights(True)
+        self.tvPluginList.setItemsExpandable(False)
+        self.tvPluginList.setSortingEnabled(True)
+        self.tvPluginList.setAllColumnsShowFocus(True)
+        self.tvPluginList.setExpandsOnDoubleClick(False)
+        self.tvPluginList.setObjectName("tvPluginList")
+        self.frameManual = QtWidgets.QFrame(self.splitterManual)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Expanding)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(1)
+        sizePolicy.setHeightForWidth(self.frameManual.sizePolicy().hasHeightForWidth())
+        self.frameManual.setSizePolicy(sizePolicy)
+        self.frameManual.setStyleSheet("")
+        self.frameManual.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.frameManual.setFrameShadow(QtWidgets.QFrame.Sunken)
+        self.frameManual.setObjectName("frameManual")
+        self.verticalLayout_3 = QtWidgets.QVBoxLayout(self.frameManual)
+        self.verticalLayout_3.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout_3.setObjectName("verticalLayout_3")
+        self.scrollArea = QtWidgets.QScrollArea(self.frameManual)
+        self.scrollArea.setStyleSheet("")
+        self.scrollArea.setFrameShape(QtWidgets.QFrame.NoFrame)
+        self.scrollArea.setFrameShadow(QtWidgets.QFrame.Plain)
+        self.scrollArea.setWidgetResizable(True)
+        self.scrollArea.setAlignment(QtCore.Qt.AlignLeading|QtCore.Qt.AlignLeft|QtCore.Qt.AlignTop)
+        self.scrollArea.setObjectName("scrollArea")
+        self.scrollAreaWidgetContents = QtWidgets.QWidget()
+        self.scrollAreaWidgetContents.setGeometry(QtCore.QRect(0, 0, 1068, 479))
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Expanding)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.scrollAreaWidgetContents.sizePolicy().hasHeightForWidth())
+        self.scrollAreaWidgetContents.setSizePolicy(sizePolicy)
+        self.scrollAreaWidgetContents.setStyleSheet("background-color: palette(base);")
+        self.scrollAreaWidgetContents.setObjectName("scrollAreaWidgetContents")
+        self.horizontalLayout = QtWidgets.QHBoxLayout(self.scrollAreaWidgetContents)
+        self.horizontalLayout.setContentsMargins(6, 6, 6, 6)
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        self.lblManual = QtWidgets.QLabel(self.scrollAreaWidgetContents)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(1)
+        sizePolicy.setHeightForWidth(self.lblManual.sizePolicy().hasHeightForWidth())
+        self.lblManual.setSizePolicy(sizePolicy)
+        self.lblManual.setStyleSheet("")
+        self.lblManual.setText("")
+        self.lblManual.setScaledContents(True)
+        self.lblManual.setAlignment(QtCore.Qt.AlignLeading|QtCore.Qt.AlignLeft|QtCore.Qt.AlignTop)
+        self.lblManual.setOpenExternalLinks(True)
+        self.lblManual.setObjectName("lblManual")
+        self.horizontalLayout.addWidget(self.lblManual)
+        self.scrollArea.setWidget(self.scrollAreaWidgetContents)
+        self.verticalLayout_3.addWidget(self.scrollArea)
+        self.verticalLayout.addWidget(self.splitterManual)
+        self.verticalLayout_2.addWidget(self.frame)
+        self.buttonBox = QtWidgets.QDialogButtonBox(Dialog)
+        self.buttonBox.setOrientation(QtCore.Qt.Horizontal)
+        self.buttonBox.setStandardButtons(QtWidgets.QDialogButtonBox.Close)
+        self.buttonBox.setObjectName("buttonBox")
+        self.verticalLayout_2.addWidget(self.buttonBox)
+
+        self.retranslateUi(Dialog)
+        self.buttonBox.accepted.connect(Dialog.accept) # type: ignore
+        self.buttonBox.rejected.connect(Dialog.reject) # type: ignore
+        QtCore.QMetaObject.connectSlotsByName(Dialog)
+
+    def retranslateUi(self, Dialog):
+        _translate = QtCore.QCoreApplication.translate
+        Dialog.setWindowTitle(_translate("Dialog", "Dialog"))
+        self.tbInstall.setToolTip(_translate("Dialog", "Install a plugin"))
+        self.tbInstall.setText(_translate("Dialog", "I"))
+        self.tbUninstall.setToolTip(_translate("Dialog", "Uninstall plugin"))
+        self.tbUninstall.setText(_translate("Dialog", "U"))
+        self.tbActivate.setToolTip(_translate("Dialog", "Activate plugin"))
+        self.tbActivate.setText(_translate("Dialog", "A"))
+from pluginmanager.pmwindow import PMPluginList